@@ -1,8 +1,8 @@
 from pathlib import Path
-import frogproto.msglib as fp
 
-# TODO: new usage
-Proto = fp.load("protocol.json")
+from frogproto import load
+
+Proto = load(Path(__file__).with_name("protocol.json"))
 
 print("=== FLIGHT message ===")
 lat = 15.833455
@@ -1,8 +1,9 @@
-from .msglib import Proto, load, BinaryFlag, MessageInstance
+from .msglib import Proto, load, BinaryFlag, MessageInstance, LazyPayload
 
 __all__ = [
     "Proto",
     "load",
     "BinaryFlag",
     "MessageInstance",
+    "LazyPayload",
 ]
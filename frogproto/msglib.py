@@ -1,5 +1,9 @@
 """Runtime protocol helpers built from a JSON schema.
 
+Payloads are msgspec Structs generated from the schema and encoded straight to
+MessagePack. When msgspec is not installed the legacy msgpack + Pydantic
+backend is used instead; both produce the same wire format.
+
 Usage:
     from frogproto.msglib import load
     proto = load("protocol.json")
@@ -11,16 +15,43 @@ Usage:
 from __future__ import annotations
 
 import enum
+import functools
+import hashlib
 import json
+import keyword
+import sys
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+try:
+    import msgspec
+except ImportError:  # legacy backend
+    msgspec = None
+
+if msgspec is None:
+    import msgpack
 
-import msgpack
-from pydantic import BaseModel, create_model
+try:
+    import orjson
+except ImportError:  # stdlib json parses schemas too, just slower
+    orjson = None
 
 MSGPACK_ENCODE_KW = {"use_bin_type": True}
 MSGPACK_DECODE_KW = {"raw": False, "use_list": False}
 
+# msgspec.Struct subclass, or pydantic.BaseModel on the legacy backend
+PayloadModel = Any
+# (field name, struct attribute name, python type, payload enum class or None),
+# resolved at load time. msgspec Struct attributes must be identifiers, so other
+# schema names get a positional attribute name and are renamed back.
+CompiledField = Tuple[str, str, Any, Any]
+
+
+# Schema datatype names of non-enum fields; "enum" fields resolve by field name.
+_SCALAR_DATATYPES: Dict[str, type] = {"int": int, "float": float, "bool": bool, "bytes": bytes, "string": str}
+
 
 class BinaryFlag(enum.IntFlag):
     NONE = 0
@@ -28,65 +59,322 @@ class BinaryFlag(enum.IntFlag):
     ROUTE = 2
 
 
-if hasattr(BaseModel, "model_config"):
-    PayloadModelBase = type(
-        "PayloadModelBase",
-        (BaseModel,),
-        {"model_config": {"extra": "forbid"}},
-    )
-else:
-    PayloadModelBase = type(
-        "PayloadModelBase",
-        (BaseModel,),
-        {"Config": type("Config", (), {"extra": "forbid"})},
-    )
+def _bytes_from_buffer(value: Any) -> Any:
+    return bytes(value) if isinstance(value, (bytearray, memoryview)) else value
+
+
+@functools.lru_cache(maxsize=None)
+def _pydantic_backend() -> Tuple[Any, type, Dict[type, Any]]:
+    """Import Pydantic on first model build: ``(create_model, PayloadModelBase, strict types)``.
+
+    Only the legacy backend builds Pydantic models, and Pydantic's import is
+    slow, so ``import frogproto`` does not pay for it.
+    """
+    from pydantic import BaseModel, StrictBool, StrictBytes, StrictFloat, StrictInt, StrictStr, create_model
+
+    if hasattr(BaseModel, "model_config"):
+        payload_model_base = type(
+            "PayloadModelBase",
+            (BaseModel,),
+            {"model_config": {"extra": "forbid"}},
+        )
+    else:
+        payload_model_base = type(
+            "PayloadModelBase",
+            (BaseModel,),
+            {"Config": type("Config", (), {"extra": "forbid"})},
+        )
+    try:
+        from pydantic import BeforeValidator
+        from typing_extensions import Annotated
+    except ImportError:  # Pydantic v1
+        bytes_type: Any = StrictBytes
+    else:
+        # StrictBytes alone rejects bytearray/memoryview, which msgspec accepts
+        bytes_type = Annotated[StrictBytes, BeforeValidator(_bytes_from_buffer)]
+    # Strict scalars validate the way msgspec does: no bool-as-int, no bytes-as-str.
+    strict_types = {int: StrictInt, float: StrictFloat, bool: StrictBool, bytes: bytes_type, str: StrictStr}
+    return create_model, payload_model_base, strict_types
 
 
 class MessageInstance:
-    def __init__(self, proto: "Proto", enum_member: enum.IntEnum, payload_model: BaseModel):
+    __slots__ = ("proto", "enum_member", "payload_model", "_msgid", "_prefix")
+
+    def __init__(self, proto: "Proto", enum_member: enum.IntEnum, payload_model: PayloadModel):
         self.proto = proto
         self.enum_member = enum_member
         self.payload_model = payload_model
+        self._msgid = enum_member._value_
+        self._prefix = enum_member._msgpack_prefix
 
-    def encode(self) -> bytes:
-        return self.proto.encode_message(self)
+    if msgspec is not None:
+
+        def encode(self) -> bytes:
+            # inlined member encoder: saves a call frame per send
+            return self._prefix + _encode_frame(_astuple(self.payload_model))
+
+    else:
+
+        def encode(self) -> bytes:
+            return self.enum_member._encoder(self.payload_model)
+
+    def encode_into(self, buf: bytearray, offset: int = 0) -> None:
+        """Encode into ``buf`` starting at ``offset``; ``buf`` is resized to fit, zero-padded past its end."""
+        _encode_payload_into(self._prefix, _payload_values(self.enum_member, self.payload_model), buf, offset)
 
     def dict(self) -> Dict[str, Any]:
         return {
             "msgid": self.proto.messageid(self.enum_member),
-            "payload": _dump_model(self.payload_model),
+            "payload": self.enum_member._dump(self.payload_model),
         }
 
 
+class LazyPayload:
+    """Undecoded payload bytes of a frame, returned by ``Proto.decode_message_lazy``."""
+
+    __slots__ = ("enum_member", "raw")
+
+    def __init__(self, enum_member: enum.IntEnum, raw: Any):
+        self.enum_member = enum_member
+        self.raw = raw
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.raw)
+
+    def decode(self, trusted: bool = False) -> Dict[str, Any]:
+        decoder = self.enum_member._trusted_decoder if trusted else self.enum_member._decoder
+        return self.enum_member._dump(decoder(_load_payload(self.raw)))
+
+
+def _unknown_msgid(msgid: Any) -> ValueError:
+    return ValueError(f"Unknown msgid {msgid!r}")
+
+
 class _Namespace:
     def __init__(self, **entries: Any):
         self.__dict__.update(entries)
 
 
-def _dump_model(model: BaseModel) -> Dict[str, Any]:
-    return model.model_dump() if hasattr(model, "model_dump") else model.dict()
+# The backend is fixed at import, so payload helpers bind without per-call checks.
+if msgspec is not None:
+    _BYTES_TYPES = (bytes, bytearray, memoryview)
+
+    def _validate_payload(model_cls: type, kwargs: Dict[str, Any]) -> PayloadModel:
+        # builtin_types: byte buffers pass through as-is; without it a str for a
+        # bytes field is taken as base64
+        return msgspec.convert(kwargs, model_cls, builtin_types=_BYTES_TYPES)
+
+    def _make_dumper(model_cls: type, fields: Tuple[CompiledField, ...]):
+        if all(f_name == f_attr for f_name, f_attr, _, _ in fields):
+            return msgspec.structs.asdict
+        field_names = tuple(f_name for f_name, _, _, _ in fields)
+
+        def dump(payload_model: PayloadModel) -> Dict[str, Any]:
+            return dict(zip(field_names, _astuple(payload_model)))
+
+        return dump
+
+else:
+
+    def _validate_payload(model_cls: type, kwargs: Dict[str, Any]) -> PayloadModel:
+        return model_cls(**kwargs)
+
+    def _make_dumper(model_cls: type, fields: Tuple[CompiledField, ...]):
+        if hasattr(model_cls, "model_dump"):
+            # warnings=False: trusted decodes hold raw ints where enum members are declared
+            return functools.partial(model_cls.model_dump, warnings=False)
+        return model_cls.dict
+
+
+# Frame codecs. On the wire a frame is [msgid, [field values in schema order]].
+# Each member precomputes the bytes up to its payload (fixarray-2 header plus
+# the packed msgid), so encoders only pack the values. Payload decoders take
+# whatever the header decoder left for the payload.
+_FRAME_ARRAY_HEADER = b"\x92"
+
+
+def _pad_to(buf: bytearray, offset: int) -> None:
+    # slice assignment past the end would append at len(buf), not at offset
+    if offset > len(buf):
+        buf.extend(bytes(offset - len(buf)))
+
+
+if msgspec is not None:
+    _ENCODER = msgspec.msgpack.Encoder()
+    _encode_frame = _ENCODER.encode
+    _astuple = msgspec.structs.astuple
+
+    def _encode_payload_into(prefix: bytes, values: Tuple[Any, ...], buf: bytearray, offset: int) -> None:
+        _pad_to(buf, offset)
+        buf[offset:] = prefix
+        _ENCODER.encode_into(values, buf, offset + len(prefix))
+
+    _decode_header = msgspec.msgpack.Decoder(Tuple[int, msgspec.Raw]).decode
+    _decode_batch_headers = msgspec.msgpack.Decoder(List[Tuple[int, msgspec.Raw]]).decode
+
+    def _split_frame(encoded: bytes) -> Tuple[int, "msgspec.Raw"]:
+        return _decode_header(encoded)
+
+    def _load_payload(raw: "msgspec.Raw") -> "msgspec.Raw":
+        # payload decoders read the Raw bytes directly
+        return raw
+
+    def _payload_values(enum_member: enum.IntEnum, payload_model: PayloadModel) -> Tuple[Any, ...]:
+        return _astuple(payload_model)
+
+    def _init_member_codecs(member: enum.IntEnum) -> None:
+        # Payloads decode into an array_like twin of the Struct, so the whole
+        # decode is one C call; decoded payloads are only ever dumped to dicts.
+        wire_cls = msgspec.defstruct(
+            member._model_cls.__name__,
+            [(f_attr, f_type) for _, f_attr, f_type, _ in member._fields],
+            module=__name__,
+            frozen=True,
+            array_like=True,
+            forbid_unknown_fields=True,
+        )
+        # Struct decoding already validates in C at construction cost.
+        member._decoder = member._trusted_decoder = msgspec.msgpack.Decoder(wire_cls).decode
+
+else:
+    # Packers keep an internal buffer between calls but are not thread-safe.
+    _PACKERS = threading.local()
+
+    def _packer() -> "msgpack.Packer":
+        packer = getattr(_PACKERS, "packer", None)
+        if packer is None:
+            packer = _PACKERS.packer = msgpack.Packer(**MSGPACK_ENCODE_KW)
+        return packer
+
+    def _encode_frame(frame: Tuple[int, Any]) -> bytes:
+        return _packer().pack(frame)
+
+    def _encode_payload_into(prefix: bytes, values: List[Any], buf: bytearray, offset: int) -> None:
+        _pad_to(buf, offset)
+        buf[offset:] = prefix + _packer().pack(values)
+
+    def _decode_header(encoded: bytes) -> Tuple[int, Tuple[Any, ...]]:
+        return msgpack.unpackb(encoded, **MSGPACK_DECODE_KW)
+
+    _decode_batch_headers = _decode_header
+
+    def _split_frame(encoded: bytes) -> Tuple[int, bytes]:
+        unpacker = msgpack.Unpacker(**MSGPACK_DECODE_KW)
+        unpacker.feed(encoded)
+        try:
+            if unpacker.read_array_header() != 2:
+                raise ValueError("Expected a [msgid, payload] frame")
+            msgid = unpacker.unpack()
+            payload_start = unpacker.tell()
+            # reject truncated and trailing bytes here, as msgspec does
+            unpacker.skip()
+        except msgpack.OutOfData:
+            raise ValueError("Truncated frame") from None
+        if unpacker.tell() != len(encoded):
+            raise ValueError("Trailing bytes after frame")
+        return msgid, encoded[payload_start:]
+
+    def _load_payload(raw: bytes) -> Tuple[Any, ...]:
+        return msgpack.unpackb(raw, **MSGPACK_DECODE_KW)
+
+    def _payload_values(enum_member: enum.IntEnum, payload_model: PayloadModel) -> List[Any]:
+        return [getattr(payload_model, f_name) for f_name in enum_member._field_names]
+
+    def _payload_kwargs(field_names: Tuple[str, ...], payload_raw: Tuple[Any, ...]) -> Dict[str, Any]:
+        # arrays unpack as tuples (use_list=False); a map would zip over its keys
+        if type(payload_raw) is not tuple:
+            raise ValueError(f"Expected payload array, got {type(payload_raw).__name__}")
+        if len(payload_raw) != len(field_names):
+            raise ValueError(f"Expected {len(field_names)} payload values, got {len(payload_raw)}")
+        return dict(zip(field_names, payload_raw))
+
+    def _make_frame_encoder(enum_member: enum.IntEnum):
+        """Generate a straight-line encoder with the msgid and field reads baked in."""
+        field_names = enum_member._field_names
+        prefix = enum_member._msgpack_prefix
+        if not all(f_name.isidentifier() and not keyword.iskeyword(f_name) for f_name in field_names):
+            # Only identifiers are spliced into generated source.
+            def encode(payload_model: PayloadModel) -> bytes:
+                return prefix + _packer().pack(_payload_values(enum_member, payload_model))
+
+            return encode
+
+        values = "".join(f"payload_model.{f_name}, " for f_name in field_names)
+        src = f"def encode(payload_model):\n    return _prefix + _packer().pack([{values}])\n"
+        namespace: Dict[str, Any] = {"_packer": _packer, "_prefix": prefix}
+        exec(compile(src, f"<frogproto {enum_member.__class__.__name__}.{enum_member.name}>", "exec"), namespace)
+        return namespace["encode"]
+
+    def _init_member_codecs(member: enum.IntEnum) -> None:
+        model_cls = member._model_cls
+        member._construct = model_cls.model_construct if hasattr(model_cls, "model_construct") else model_cls.construct
+        # instance attribute; generated code is per message by design
+        member._encoder = _make_frame_encoder(member)
+
+
+class _MessageEnum(enum.IntEnum):
+    """Base of the generated per-type message enums.
+
+    The annotated attributes are filled in by ``_make_message_enum``: ``_proto``
+    and ``_payload_models`` on the enum class, the rest on each member. The
+    codec methods are shared by all members and read that per-member state;
+    where a backend needs per-message code (msgspec decoders, generated legacy
+    encoders) ``_init_member_codecs`` sets it on the member instead.
+    """
+
+    _proto: "Proto"
+    _payload_models: Dict[str, type]
+    _model_cls: type
+    _fields: Tuple[CompiledField, ...]
+    _field_names: Tuple[str, ...]
+    _dump: Any
+    _msgpack_prefix: bytes
+    _empty_frame: Union[bytes, None]
+    _msg_str: str
+    _construct: Any  # legacy backend
+
+    def payload(self, **kwargs: Any) -> PayloadModel:
+        return _validate_payload(self._model_cls, kwargs)
+
+    def __call__(self, **kwargs: Any) -> MessageInstance:
+        return MessageInstance(self._proto, self, _validate_payload(self._model_cls, kwargs))
+
+    if msgspec is not None:
+
+        def _encoder(self, payload_model: PayloadModel) -> bytes:
+            # structs.astuple is C and as fast as generated attribute reads
+            return self._msgpack_prefix + _encode_frame(_astuple(payload_model))
+
+    else:
+
+        def _decoder(self, payload_raw: Tuple[Any, ...]) -> PayloadModel:
+            return self._model_cls(**_payload_kwargs(self._field_names, payload_raw))
+
+        def _trusted_decoder(self, payload_raw: Tuple[Any, ...]) -> PayloadModel:
+            return self._construct(**_payload_kwargs(self._field_names, payload_raw))
 
 
 def _make_message_enum(
     name: str,
     members: Dict[str, int],
-    payload_models: Dict[str, BaseModel],
+    payload_models: Dict[str, type],
+    compiled_fields: Dict[str, Tuple[CompiledField, ...]],
     proto: "Proto",
 ) -> enum.IntEnum:
-    enum_cls = enum.IntEnum(name, members)
-
-    def payload(self, **kwargs: Any) -> BaseModel:
-        model_cls = payload_models[self.name]
-        return model_cls(**kwargs)
-
-    def build(self, **kwargs: Any) -> MessageInstance:
-        model = payload(self, **kwargs)
-        return MessageInstance(proto, self, model)
-
-    enum_cls.payload = payload
-    enum_cls.__call__ = build
+    enum_cls = _MessageEnum(name, members)
     enum_cls._payload_models = payload_models  # type: ignore[attr-defined]
     enum_cls._proto = proto  # type: ignore[attr-defined]
+    for member in enum_cls:
+        model_cls = payload_models[member.name]
+        fields = compiled_fields[member.name]
+        member._model_cls = model_cls
+        member._fields = fields
+        member._field_names = tuple(f_name for f_name, _, _, _ in fields)
+        member._dump = _make_dumper(model_cls, fields)
+        member._msgpack_prefix = _FRAME_ARRAY_HEADER + _encode_frame(member._value_)
+        # field-less messages always encode to the same bytes
+        member._empty_frame = member._msgpack_prefix + _encode_frame(()) if not fields else None
+        _init_member_codecs(member)
     return enum_cls
 
 
@@ -97,7 +385,6 @@ class Proto:
         self.version: int = int(schema["PROTOCOL_VERSION"])
 
         self._id_to_enum: Dict[int, enum.IntEnum] = {}
-        self._id_to_str: Dict[int, str] = {}
         self._payload_enums: Dict[str, enum.IntEnum] = {}
 
         self.enum = self._init_payload_enums(schema.get("enums", {}))
@@ -114,28 +401,48 @@ class Proto:
 
     def _datatype_to_type(self, datatype: str, field_name: str):
         if datatype == "enum":
-            return self._payload_enums[field_name]
-        if datatype == "int":
-            return int
-        if datatype == "float":
-            return float
-        if datatype == "bool":
-            return bool
-        if datatype == "bytes":
-            return bytes
-        if datatype == "string":
-            return str
-        raise ValueError(f"Unsupported datatype '{datatype}' for field '{field_name}'")
-
-    def _build_payload_model(self, path: str, fields: List[Dict[str, Any]]) -> BaseModel:
-        model_fields: Dict[str, Tuple[Any, Any]] = {}
-        for field in fields:
-            f_name = field["name"]
+            try:
+                return self._payload_enums[field_name]
+            except KeyError:
+                raise ValueError(f"Enum field '{field_name}' has no matching entry in \"enums\"") from None
+        try:
+            return _SCALAR_DATATYPES[datatype]
+        except KeyError:
+            raise ValueError(f"Unsupported datatype '{datatype}' for field '{field_name}'") from None
+
+    def _compile_fields(self, fields: List[Dict[str, Any]]) -> Tuple[CompiledField, ...]:
+        compiled: List[CompiledField] = []
+        names = {field["name"] for field in fields}
+        for index, field in enumerate(fields):
+            # json.loads does not intern; kwargs keys from call sites are
+            # interned, so interned names make payload dict lookups pointer
+            # comparisons.
+            f_name = sys.intern(field["name"])
+            f_attr = f_name
+            if not f_name.isidentifier():
+                f_attr = f"_{index}"
+                while f_attr in names:
+                    f_attr = "_" + f_attr
             f_type = self._datatype_to_type(field["datatype"], f_name)
-            model_fields[f_name] = (f_type, ...)
+            enum_cls = f_type if field["datatype"] == "enum" else None
+            compiled.append((f_name, f_attr, f_type, enum_cls))
+        return tuple(compiled)
 
+    def _build_payload_model(self, path: str, fields: Tuple[CompiledField, ...]) -> type:
         model_name = path.replace(".", "_")
-        return create_model(model_name, __base__=PayloadModelBase, __module__=__name__, **model_fields)  # type: ignore[return-value]
+        if msgspec is not None:
+            return msgspec.defstruct(
+                model_name,
+                [(f_attr, f_type) for _, f_attr, f_type, _ in fields],
+                rename={f_attr: f_name for f_name, f_attr, _, _ in fields if f_attr != f_name} or None,
+                module=__name__,
+                frozen=True,
+                forbid_unknown_fields=True,
+            )
+
+        create_model, payload_model_base, strict_types = _pydantic_backend()
+        model_fields = {f_name: (strict_types.get(f_type, f_type), ...) for f_name, _, f_type, _ in fields}
+        return create_model(model_name, __base__=payload_model_base, __module__=__name__, **model_fields)  # type: ignore[return-value]
 
     def _init_messages(self, messages_spec: Dict[str, Any]) -> Tuple[_Namespace, enum.IntEnum]:
         categories: Dict[str, _Namespace] = {}
@@ -148,20 +455,23 @@ class Proto:
 
             for typ_name, message_map in type_map.items():
                 member_values: Dict[str, int] = {}
-                payload_models: Dict[str, BaseModel] = {}
+                payload_models: Dict[str, type] = {}
+                compiled_fields: Dict[str, Tuple[CompiledField, ...]] = {}
+                paths: Dict[str, str] = {}
 
                 for msg_name, fields in message_map.items():
                     member_values[msg_name] = msg_id
-                    path = f"{category_name}.{typ_name}.{msg_name}"
-                    self._id_to_str[msg_id] = path
-                    payload_models[msg_name] = self._build_payload_model(path, fields)
+                    path = paths[msg_name] = f"{category_name}.{typ_name}.{msg_name}"
+                    compiled = compiled_fields[msg_name] = self._compile_fields(fields)
+                    payload_models[msg_name] = self._build_payload_model(path, compiled)
                     msg_id += 1
 
                 enum_name = f"{category_name}_{typ_name}_Msg"
-                enum_cls = _make_message_enum(enum_name, member_values, payload_models, self)
-                type_entries[typ_name] = enum_cls
+                enum_cls = _make_message_enum(enum_name, member_values, payload_models, compiled_fields, self)
                 for member in enum_cls:
-                    self._id_to_enum[int(member.value)] = member
+                    member._msg_str = paths[member.name]
+                type_entries[typ_name] = enum_cls
+                self._id_to_enum.update(enum_cls._value2member_map_)
 
             categories[category_name] = _Namespace(**type_entries)
 
@@ -169,42 +479,173 @@ class Proto:
         return _Namespace(**categories), message_category_enum
 
     def messageid(self, msg: Union[enum.IntEnum, MessageInstance]) -> int:
-        enum_member = msg.enum_member if isinstance(msg, MessageInstance) else msg
-        return int(enum_member.value)
+        if isinstance(msg, MessageInstance):
+            return msg._msgid
+        # _value_ is the plain int; .value goes through a property descriptor
+        return msg._value_
 
     def message_str_from_id(self, msgid: int) -> str:
-        return self._id_to_str[msgid]
+        return self.get_message_enum(msgid)._msg_str
 
     def get_message_enum(self, msgid: int) -> enum.IntEnum:
-        return self._id_to_enum[msgid]
+        try:
+            return self._id_to_enum[msgid]
+        except KeyError:
+            raise _unknown_msgid(msgid) from None
+
+    def peek_msgid(self, encoded: bytes) -> int:
+        """Read only the msgid of a frame; the payload is not decoded."""
+        return _split_frame(encoded)[0]
+
+    def decode_message_lazy(self, encoded: bytes) -> Tuple[enum.IntEnum, LazyPayload]:
+        """Resolve the message enum and defer payload decoding to ``LazyPayload.decode``."""
+        msgid, payload_raw = _split_frame(encoded)
+        enum_member = self.get_message_enum(msgid)
+        return enum_member, LazyPayload(enum_member, payload_raw)
 
-    def encode_message(self, msg: Union[enum.IntEnum, MessageInstance], payload_model: BaseModel | None = None) -> bytes:
+    def encode_message(self, msg: Union[enum.IntEnum, MessageInstance], payload_model: PayloadModel | None = None) -> bytes:
         if isinstance(msg, MessageInstance):
             enum_member = msg.enum_member
             payload_model = msg.payload_model
         else:
             enum_member = msg
-            payload_model = payload_model if payload_model is not None else enum_member.payload()
+            if payload_model is None:
+                if enum_member._empty_frame is not None:
+                    return enum_member._empty_frame
+                # raises for the missing fields
+                payload_model = enum_member.payload()
+
+        return enum_member._encoder(payload_model)
+
+    def encode_batch(self, messages: Iterable[MessageInstance]) -> bytes:
+        """Encode several messages as one MessagePack array of frames."""
+        return _encode_frame(
+            [(msg._msgid, _payload_values(msg.enum_member, msg.payload_model)) for msg in messages]
+        )
+
+    def decode_batch(self, encoded: bytes, trusted: bool = False) -> List[Tuple[enum.IntEnum, Dict[str, Any]]]:
+        """Decode an ``encode_batch`` buffer into ``(enum_member, payload_dict)`` pairs."""
+        decode_frame = self._decode_frame
+        return [decode_frame(msgid, payload_raw, trusted) for msgid, payload_raw in _decode_batch_headers(encoded)]
+
+    def decode_many(
+        self, frames: Iterable[bytes], trusted: bool = False
+    ) -> Iterator[Tuple[enum.IntEnum, Dict[str, Any]]]:
+        """Lazily decode separately encoded frames, e.g. as read off a link or replay log."""
+        decode_frame = self._decode_frame
+        for encoded in frames:
+            msgid, payload_raw = _decode_header(encoded)
+            yield decode_frame(msgid, payload_raw, trusted)
+
+    def _decode_frame(
+        self, msgid: int, payload_raw: Any, trusted: bool
+    ) -> Tuple[enum.IntEnum, Dict[str, Any]]:
+        enum_member = self.get_message_enum(msgid)
+        decoder = enum_member._trusted_decoder if trusted else enum_member._decoder
+        return enum_member, enum_member._dump(decoder(payload_raw))
 
-        payload_dict = _dump_model(payload_model)
-        msgid = self.messageid(enum_member)
-        return msgpack.packb((msgid, payload_dict), **MSGPACK_ENCODE_KW)
+    def decode_message(self, encoded: bytes, trusted: bool = False) -> Tuple[enum.IntEnum, Dict[str, Any]]:
+        """Decode a frame into ``(enum_member, payload_dict)``.
 
-    def decode_message(self, encoded: bytes) -> Tuple[enum.IntEnum, Dict[str, Any]]:
-        msgid, payload_raw = msgpack.unpackb(encoded, **MSGPACK_DECODE_KW)
-        enum_member = self.get_message_enum(msgid)
-        payload_model = enum_member.payload(**payload_raw)
-        return enum_member, _dump_model(payload_model)
+        ``trusted=True`` is for frames produced by an encoder using the same
+        schema: the legacy Pydantic backend then skips validation and coercion
+        (enum fields stay plain ints). The msgspec backend always validates,
+        which costs no more than constructing the Struct.
+        """
+        msgid, payload_raw = _decode_header(encoded)
+        return self._decode_frame(msgid, payload_raw, trusted)
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data).encode()
+
+
+def _json_key(data: Dict[str, Any]) -> bytes:
+    # insertion order assigns msgids, so it must stay part of the key
+    return _json_dumps(data)
+
+
+# Both caches are LRUs of at most this many entries, so edited schemas and
+# per-tenant dicts do not keep every old Proto alive.
+_CACHE_MAXSIZE = 32
+# Compiled protocols keyed by a digest of the schema JSON, shared across load() calls
+_PROTO_CACHE: "OrderedDict[bytes, Proto]" = OrderedDict()
+# resolved path -> ((mtime_ns, size), Proto), so unchanged files are not even
+# re-read; a changed file replaces its entry
+_PATH_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], Proto]]" = OrderedDict()
+
+
+# One lock for both caches: a lookup's move_to_end must not race an eviction.
+_CACHE_LOCK = threading.Lock()
 
 
-def load(source: Union[str, Path, Dict[str, Any]]) -> Proto:
+def _cache_get(cache: OrderedDict, key: Any) -> Any:
+    with _CACHE_LOCK:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    with _CACHE_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _CACHE_MAXSIZE:
+            cache.popitem(last=False)
+
+
+def load(source: Union[str, Path, Dict[str, Any]], cache: bool = True) -> Proto:
+    """Build a ``Proto`` from a schema path or dict.
+
+    Identical schemas return the same compiled ``Proto`` unless ``cache=False``.
+    Dicts are keyed by content, so a mutated dict is compiled afresh; files are
+    first matched on path, mtime and size. Both caches keep only the most
+    recently used protocols; ``load.cache_clear()`` empties them.
+    """
+    path_key = None
     if isinstance(source, (str, Path)):
-        data = json.loads(Path(source).read_text())
+        path = Path(source).resolve()
+        if cache:
+            st = path.stat()
+            path_key = str(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            entry = _cache_get(_PATH_CACHE, path_key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+        raw = path.read_bytes()
+        data = _json_loads(raw)
     elif isinstance(source, dict):
         data = source
+        raw = _json_key(source) if cache else b""
     else:
         raise TypeError("source must be a path or a dict")
-    return Proto(data)
+    if not cache:
+        return Proto(data)
+
+    key = hashlib.blake2b(raw, digest_size=16).digest()
+    proto = _cache_get(_PROTO_CACHE, key)
+    if proto is None:
+        proto = Proto(data)
+        _cache_put(_PROTO_CACHE, key, proto)
+    if path_key is not None:
+        _cache_put(_PATH_CACHE, path_key, (stamp, proto))
+    return proto
+
+
+def _cache_clear() -> None:
+    with _CACHE_LOCK:
+        _PROTO_CACHE.clear()
+        _PATH_CACHE.clear()
+
+
+load.cache_clear = _cache_clear  # type: ignore[attr-defined]
 
 
-__all__ = ["Proto", "load", "BinaryFlag", "MessageInstance"]
+__all__ = ["Proto", "load", "BinaryFlag", "MessageInstance", "LazyPayload"]
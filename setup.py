@@ -1,5 +1,7 @@
+import os
 import sys
 from setuptools import setup, find_packages
+from setuptools.command.build_ext import build_ext
 
 if sys.version_info < (3, 8):
     sys.exit("Sorry, Python < 3.8 is not supported.")
@@ -7,6 +9,39 @@ if sys.version_info < (3, 8):
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+
+class OptionalBuildExt(build_ext):
+    """Compiled modules are a speedup only; install pure Python if the build fails."""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:
+            print(f"WARNING: skipping compiled frogproto modules ({exc})")
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as exc:
+            print(f"WARNING: skipping compiled module {ext.name} ({exc})")
+
+
+# Opt-in: FROGPROTO_CYTHON=1 compiles msglib.py unchanged with Cython. The .py
+# stays importable as the fallback. With msgspec doing the (de)serialization in
+# C the gain is limited to message construction, so pure Python is the default.
+ext_modules = []
+if os.environ.get("FROGPROTO_CYTHON"):
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        print("WARNING: FROGPROTO_CYTHON set but Cython is not installed")
+    else:
+        ext_modules = cythonize(
+            ["frogproto/msglib.py"],
+            compiler_directives={"language_level": "3", "annotation_typing": False, "infer_types": False},
+            quiet=True,
+        )
+
 setup(
     name="frogproto",
     packages=[package for package in find_packages()],
@@ -20,9 +55,13 @@ setup(
     url="https://github.com/xznhj8129/frogproto",
     download_url="",
     include_package_data=True,
-    keywords=["protocol", "msgpack"],
-    install_requires=["msgpack", "pydantic"],
+    keywords=["protocol", "msgpack", "msgspec"],
+    # oldest releases the test suite passes on
+    install_requires=["msgspec>=0.21"],
+    extras_require={"legacy": ["msgpack>=1.0", "pydantic>=2.0"], "orjson": ["orjson"]},
     package_data={"frogproto": ["protocol/*.json"]},
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": OptionalBuildExt},
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from frogproto import load, msglib
+
+
+def _schema(*categories):
+    return {
+        "PROTOCOL_NAME": "test",
+        "PROTOCOL_VERSION": 1,
+        "messages": {name: {"S": {msg: []}} for name, msg in categories},
+        "enums": {},
+    }
+
+
+class LoadCacheTest(unittest.TestCase):
+    def setUp(self):
+        load.cache_clear()
+
+    def test_identical_dicts_share_proto(self):
+        self.assertIs(load(_schema(("A", "PING"))), load(_schema(("A", "PING"))))
+
+    def test_message_order_is_part_of_dict_key(self):
+        a = load(_schema(("A", "PING"), ("B", "PONG")))
+        b = load(_schema(("B", "PONG"), ("A", "PING")))
+        self.assertIsNot(a, b)
+        self.assertEqual(b.messageid(b.msg.B.S.PONG), 1)
+        self.assertEqual(b.decode_message(b.msg.B.S.PONG().encode())[0], b.msg.B.S.PONG)
+
+    def test_dict_cache_is_bounded(self):
+        first = load(_schema(("A", "M0")))
+        for i in range(1, msglib._CACHE_MAXSIZE + 1):
+            load(_schema(("A", f"M{i}")))
+        self.assertEqual(len(msglib._PROTO_CACHE), msglib._CACHE_MAXSIZE)
+        self.assertIsNot(load(_schema(("A", "M0"))), first)
+
+    def test_edited_file_replaces_its_entry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "proto.json"
+            path.write_text(json.dumps(_schema(("A", "PING"))))
+            first = load(path)
+            path.write_text(json.dumps(_schema(("A", "PING"), ("B", "PONG"))))
+            os.utime(path, ns=(1, 1))
+            second = load(path)
+            self.assertIsNot(first, second)
+            self.assertIs(load(path), second)
+            self.assertEqual(len(msglib._PATH_CACHE), 1)
+
+    def test_concurrent_loads_while_evicting(self):
+        errors = []
+
+        def worker():
+            try:
+                for i in range(4 * msglib._CACHE_MAXSIZE):
+                    load(_schema(("A", f"M{i % (msglib._CACHE_MAXSIZE + 8)}")))
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(msglib._PROTO_CACHE), msglib._CACHE_MAXSIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import importlib
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from frogproto import msglib
+
+SCHEMA = Path(__file__).resolve().parent.parent / "protocol.json"
+
+
+def _import_legacy_msglib():
+    """Import a separate copy of ``frogproto.msglib`` with msgspec hidden."""
+    with mock.patch.dict(sys.modules, {"msgspec": None}):
+        for name in [name for name in sys.modules if name.split(".")[0] == "frogproto"]:
+            del sys.modules[name]
+        return importlib.import_module("frogproto.msglib")
+
+
+class PayloadTests:
+    """Behaviour shared by both backends; subclasses set ``msglib``."""
+
+    msglib = None
+
+    def setUp(self):
+        self.proto = self.msglib.load(SCHEMA)
+        self.msg = self.proto.msg
+
+    def flight(self):
+        return self.msg.Status.System.FLIGHT(
+            FlightMode=self.proto.enum.FlightMode.LOITER,
+            airspeed=100,
+            groundspeed=90,
+            heading=0,
+            msl_alt=100,
+            lat=1,
+            lon=2,
+        )
+
+    def test_round_trip(self):
+        for msg in (self.flight(), self.msg.Testing.System.TEXTMSG(textdata="hi")):
+            self.assertEqual(self.proto.decode_message(msg.encode()), (msg.enum_member, msg.dict()["payload"]))
+
+    def test_trusted_decode(self):
+        msg = self.flight()
+        enum_member, payload = self.proto.decode_message(msg.encode(), trusted=True)
+        self.assertIs(enum_member, msg.enum_member)
+        self.assertEqual(payload, msg.dict()["payload"])
+
+    def test_batch_round_trip(self):
+        messages = [self.flight(), self.msg.Heartbeat.System.HEARTBEAT(), self.msg.Testing.System.BINMSG(data=b"\x00")]
+        decoded = self.proto.decode_batch(self.proto.encode_batch(messages))
+        self.assertEqual(decoded, [(msg.enum_member, msg.dict()["payload"]) for msg in messages])
+        self.assertEqual(self.proto.decode_batch(self.proto.encode_batch([])), [])
+
+    def test_decode_many(self):
+        messages = [self.flight(), self.msg.Heartbeat.System.HEARTBEAT()]
+        decoded = self.proto.decode_many(msg.encode() for msg in messages)
+        self.assertEqual(list(decoded), [(msg.enum_member, msg.dict()["payload"]) for msg in messages])
+
+    def test_peek_and_lazy_decode(self):
+        msg = self.flight()
+        frame = msg.encode()
+        self.assertEqual(self.proto.peek_msgid(frame), self.proto.messageid(msg))
+        enum_member, lazy = self.proto.decode_message_lazy(frame)
+        self.assertIs(enum_member, msg.enum_member)
+        self.assertEqual(lazy.decode(), msg.dict()["payload"])
+        self.assertEqual(lazy.decode(trusted=True), msg.dict()["payload"])
+        # the frame is [fixarray-2 header, msgid < 128] + payload
+        self.assertEqual(bytes(lazy), frame[2:])
+
+    def test_empty_message_frame(self):
+        heartbeat = self.msg.Heartbeat.System.HEARTBEAT
+        frame = self.proto.encode_message(heartbeat)
+        self.assertEqual(frame, heartbeat().encode())
+        self.assertEqual(frame, self.proto.encode_message(heartbeat, heartbeat.payload()))
+        self.assertEqual(self.proto.decode_message(frame), (heartbeat, {}))
+        with self.assertRaises(ValueError):
+            self.proto.encode_message(self.msg.Testing.System.TEXTMSG)
+
+    def test_bytes_field_rejects_str(self):
+        for value in ("AAE=", "ab"):
+            with self.assertRaises(ValueError):
+                self.msg.Testing.System.BINMSG(data=value)
+
+    def test_bytes_field_accepts_byte_buffers(self):
+        for value in (b"ab", bytearray(b"ab"), memoryview(b"ab")):
+            _, payload = self.proto.decode_message(self.msg.Testing.System.BINMSG(data=value).encode())
+            self.assertEqual(payload, {"data": b"ab"})
+
+    def test_encode_into_offset_inside_buffer_truncates_tail(self):
+        msg = self.msg.Testing.System.TEXTMSG(textdata="hi")
+        buf = bytearray(b"ABCDEFGHIJKLMNOP")
+        msg.encode_into(buf, 2)
+        self.assertEqual(bytes(buf), b"AB" + msg.encode())
+
+    def test_encode_into_offset_past_end_is_zero_padded(self):
+        msg = self.msg.Testing.System.TEXTMSG(textdata="hi")
+        buf = bytearray(b"AB")
+        msg.encode_into(buf, 5)
+        self.assertEqual(bytes(buf), b"AB\x00\x00\x00" + msg.encode())
+
+    def test_unknown_msgid_raises_value_error_everywhere(self):
+        frame = b"\x92\x7f\x90"
+        lookups = [
+            lambda: self.proto.get_message_enum(127),
+            lambda: self.proto.message_str_from_id(127),
+            lambda: self.proto.decode_message(frame),
+            lambda: self.proto.decode_message_lazy(frame),
+            lambda: list(self.proto.decode_many([frame])),
+        ]
+        for lookup in lookups:
+            with self.assertRaisesRegex(ValueError, "Unknown msgid 127"):
+                lookup()
+
+    def test_truncated_and_trailing_frames_raise_value_error(self):
+        good = self.msg.Testing.System.TEXTMSG(textdata="hi").encode()
+        for frame in (b"", b"\x92", b"\x92\x01", good[:-1], good + b"\x00"):
+            for decode in (self.proto.peek_msgid, self.proto.decode_message_lazy, self.proto.decode_message):
+                with self.assertRaises(ValueError):
+                    decode(frame)
+
+    def test_map_payload_is_rejected(self):
+        # fixarray-2, msgid 2 (TEXTMSG), {"textdata": "hello"}
+        frame = b"\x92\x02\x81\xa8textdata\xa5hello"
+        for trusted in (False, True):
+            with self.assertRaises(ValueError):
+                self.proto.decode_message(frame, trusted=trusted)
+
+    def test_non_identifier_field_names_round_trip(self):
+        proto = self.msglib.load(
+            {
+                "PROTOCOL_NAME": "test",
+                "PROTOCOL_VERSION": 1,
+                "messages": {"A": {"S": {"M": [{"name": "a-b", "datatype": "int"}, {"name": "class", "datatype": "int"}]}}},
+                "enums": {},
+            }
+        )
+        msg = proto.msg.A.S.M(**{"a-b": 1, "class": 2})
+        self.assertEqual(msg.dict()["payload"], {"a-b": 1, "class": 2})
+        self.assertEqual(proto.decode_message(msg.encode())[1], {"a-b": 1, "class": 2})
+        with self.assertRaises(ValueError):
+            proto.msg.A.S.M(a_b=1, **{"class": 2})
+
+
+class DefaultBackendTest(PayloadTests, unittest.TestCase):
+    msglib = msglib
+
+
+class LegacyBackendTest(PayloadTests, unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import msgpack  # noqa: F401
+            import pydantic  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest("legacy extra (msgpack, pydantic) is not installed")
+        cls.msglib = _import_legacy_msglib()
+        assert cls.msglib.msgspec is None
+
+
+if __name__ == "__main__":
+    unittest.main()